@@ -13,6 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from mcp.services.freqkv_service import FreqKVService
 from mcp.services.lococo_service import LoCoCoService
+from mcp.services.pipeline import CompressionPipeline
 from mcp.services.routing_service import RoutingService
 from mcp.utils.model_registry import ModelRegistry
 
@@ -22,7 +23,7 @@ async def demo_compression():
     
     # Create sample KV cache
     np.random.seed(42)
-    kv_cache = np.random.randn(200, 64).tolist()
+    kv_cache = np.random.randn(200, 64).astype(np.float32)
     print(f"Original KV cache size: {len(kv_cache)} tokens")
     
     # Initialize services
@@ -30,11 +31,11 @@ async def demo_compression():
     lococo = LoCoCoService()
     
     # Apply FreqKV compression
-    freq_compressed = await freqkv.compress(kv_cache, sink_tokens=10, compression_ratio=0.7)
+    freq_compressed = freqkv.compress(kv_cache, sink_tokens=10, compression_ratio=0.7)
     print(f"After FreqKV compression: {len(freq_compressed)} tokens")
     
     # Apply LoCoCo fusion
-    final_compressed = await lococo.fuse(freq_compressed, target_ratio=0.5)
+    final_compressed = lococo.fuse(freq_compressed, target_ratio=0.5)
     print(f"After LoCoCo fusion: {len(final_compressed)} tokens")
     
     # Calculate final compression ratio
@@ -58,18 +59,23 @@ async def demo_routing():
         "Design a microservices architecture for this e-commerce platform"
     ]
     
-    for prompt in test_prompts:
-        complexity = await routing.classify_complexity(prompt)
+    async def route(prompt):
+        complexity = routing.classify_complexity(prompt)
         model = registry.get_model_for_complexity(complexity)
-        
+        response = await routing.generate_response(prompt, model, complexity=complexity)
+        return prompt, complexity, model, response
+    
+    # Route all prompts concurrently
+    results = await asyncio.gather(*(route(prompt) for prompt in test_prompts))
+    
+    for prompt, complexity, model, response in results:
         print(f"Prompt: {prompt}")
         print(f"Classified as: {complexity}")
         print(f"Routed to: {model}")
-        
-        # Generate mock response
-        response = await routing.generate_response(prompt, model)
         print(f"Response: {response}")
         print("-" * 50)
+    
+    await routing.aclose()
 
 async def demo_full_pipeline():
     """Demo the complete pipeline"""
@@ -77,7 +83,7 @@ async def demo_full_pipeline():
     
     # Sample data
     np.random.seed(42)
-    kv_cache = np.random.randn(150, 32).tolist()
+    kv_cache = np.random.randn(150, 32).astype(np.float32)
     prompt = "Implement a caching layer for this API with Redis"
     
     print(f"Input: KV cache with {len(kv_cache)} tokens")
@@ -85,30 +91,31 @@ async def demo_full_pipeline():
     print()
     
     # Initialize all services
-    freqkv = FreqKVService()
-    lococo = LoCoCoService()
+    pipeline = CompressionPipeline(FreqKVService(), LoCoCoService())
     routing = RoutingService()
     registry = ModelRegistry()
     await registry.initialize()
     
-    # Step 1: Compress KV cache
-    freq_compressed = await freqkv.compress(kv_cache, sink_tokens=5)
-    final_compressed = await lococo.fuse(freq_compressed, target_ratio=0.6)
-    
-    print(f"Compressed KV: {len(kv_cache)} → {len(final_compressed)} tokens")
-    
-    # Step 2: Route prompt
-    complexity = await routing.classify_complexity(prompt)
+    # Steps 1 and 2 are independent: compress KV cache and classify prompt concurrently
+    final_compressed, complexity = await asyncio.gather(
+        asyncio.to_thread(pipeline.compress_and_fuse, kv_cache, sink_tokens=5, target_ratio=0.6),
+        routing.classify_complexity_async(prompt)
+    )
     model = registry.get_model_for_complexity(complexity)
     
+    print(f"Compressed KV: {len(kv_cache)} → {len(final_compressed)} tokens")
     print(f"Prompt complexity: {complexity}")
     print(f"Selected model: {model}")
     
     # Step 3: Generate response
     context = f"[Using compressed KV context with {len(final_compressed)} tokens]"
-    response = await routing.generate_response(prompt, model, context=context)
+    response = await routing.generate_response(
+        prompt, model, context=context, complexity=complexity
+    )
     
     print(f"Generated response: {response}")
+    
+    await routing.aclose()
 
 async def main():
     """Run all demos"""
@@ -38,6 +38,11 @@ def main():
         "--config-path",
         help="Path to configuration directory"
     )
+    parser.add_argument(
+        "--fft-workers",
+        type=int,
+        help="Number of threads used for DCT transforms (default: CPU count)"
+    )
     
     args = parser.parse_args()
     
@@ -49,6 +54,11 @@ def main():
         import os
         os.environ["MCP_CONFIG_PATH"] = args.config_path
     
+    # Set DCT thread count if provided
+    if args.fft_workers:
+        import os
+        os.environ["MCP_FFT_WORKERS"] = str(args.fft_workers)
+    
     # Run the server
     uvicorn.run(
         "mcp.server:app",
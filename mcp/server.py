@@ -3,27 +3,42 @@ Global MCP Server - Main entry point for the MCP toolchain
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, Any, List, Optional, Tuple, Union
 import asyncio
+import concurrent.futures
 import json
 import logging
+import os
+import numpy as np
+import orjson
 from pathlib import Path
 
+from .services._batcher import MicroBatcher
 from .services.freqkv_service import FreqKVService
 from .services.lococo_service import LoCoCoService
+from .services.pipeline import CompressionPipeline
 from .services.routing_service import RoutingService
 from .utils.config_loader import ConfigLoader
 from .utils.model_registry import ModelRegistry
+from .utils.kv_codec import decode_fp16_b64, decode_int8_b64, encode_fp16_b64
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, serializing NumPy arrays without tolist()"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
 app = FastAPI(
     title="Global MCP Server",
     description="MCP server with KV compression and intelligent routing",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for development
@@ -47,9 +62,28 @@ class MCPResponse(BaseModel):
     id: Optional[str] = None
 
 class KVCompressionRequest(BaseModel):
-    kv_cache: List[List[float]]
-    sink_tokens: int = 10
-    compression_ratio: float = 0.5
+    # Either nested JSON floats, or a base64 float16 / int8 buffer plus its shape
+    kv_cache: Any = None
+    kv_cache_fp16_b64: Optional[str] = None
+    kv_cache_int8_b64: Optional[str] = None
+    kv_scales_b64: Optional[str] = None
+    kv_shape: Optional[List[int]] = None
+    sink_tokens: int = Field(10, ge=0)
+    compression_ratio: float = Field(0.5, gt=0.0, le=1.0)
+    
+    @field_validator("kv_cache")
+    @classmethod
+    def validate_kv_cache(cls, v: Any) -> Optional[np.ndarray]:
+        """Parse nested floats into a float32 array in one NumPy call instead of per element"""
+        if v is None:
+            return None
+        try:
+            kv_array = np.asarray(v, dtype=np.float32)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"kv_cache must be a rectangular array of numbers: {e}")
+        if kv_array.ndim != 2:
+            raise ValueError(f"kv_cache must be 2-D, got {kv_array.ndim} dimensions")
+        return kv_array
 
 class PromptRoutingRequest(BaseModel):
     prompt: str
@@ -57,12 +91,60 @@ class PromptRoutingRequest(BaseModel):
     max_tokens: Optional[int] = None
 
 # Global services
-freqkv_service = FreqKVService()
+fft_workers = os.environ.get("MCP_FFT_WORKERS")
+freqkv_service = FreqKVService(fft_workers=int(fft_workers) if fft_workers else None)
 lococo_service = LoCoCoService()
+compression_pipeline = CompressionPipeline(freqkv_service, lococo_service)
 routing_service = RoutingService()
 config_loader = ConfigLoader()
 model_registry = ModelRegistry()
 
+# CPU-bound compression runs here so it does not block the event loop;
+# SciPy's transforms release the GIL, so threads overlap on multi-core hosts
+EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
+
+def _process_compression_batch(
+    items: List[Tuple[np.ndarray, int, float]]
+) -> List[Union[np.ndarray, Exception]]:
+    """
+    Compress a batch of (kv_array, sink_tokens, compression_ratio) requests
+    
+    A request that fails gets its exception back as its result, so one bad
+    request does not fail the others in the batch.
+    """
+    # Requests with the same shape and settings share one stacked pipeline pass
+    groups: Dict[Tuple[Any, ...], List[int]] = {}
+    for index, (kv_array, sink_tokens, compression_ratio) in enumerate(items):
+        groups.setdefault((kv_array.shape, sink_tokens, compression_ratio), []).append(index)
+    
+    results: List[Union[np.ndarray, Exception, None]] = [None] * len(items)
+    for (shape, sink_tokens, compression_ratio), indices in groups.items():
+        if len(indices) > 1 and len(shape) == 2:
+            try:
+                stacked = np.stack([items[i][0] for i in indices])
+                compressed = compression_pipeline.compress_and_fuse(
+                    stacked, sink_tokens=sink_tokens, target_ratio=compression_ratio
+                )
+                for i, kv_compressed in zip(indices, compressed):
+                    results[i] = kv_compressed
+                continue
+            except Exception as e:
+                logger.warning(f"Stacked compression of {len(indices)} requests failed, retrying one by one: {e}")
+        
+        for i in indices:
+            try:
+                results[i] = compression_pipeline.compress_and_fuse(
+                    items[i][0], sink_tokens=sink_tokens, target_ratio=compression_ratio
+                )
+            except Exception as e:
+                results[i] = e
+    
+    return results
+
+compression_batcher = MicroBatcher(
+    _process_compression_batch, max_batch=32, max_wait_ms=10.0, executor=EXECUTOR
+)
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize services and load configurations"""
@@ -72,11 +154,20 @@ async def startup_event():
     try:
         await config_loader.load_configs()
         await model_registry.initialize()
+        compression_batcher.start()
         logger.info("Services initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize services: {e}")
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks"""
+    logger.info("Shutting down Global MCP Server...")
+    await compression_batcher.stop()
+    await routing_service.aclose()
+    EXECUTOR.shutdown(wait=False)
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -90,7 +181,7 @@ async def handle_mcp_request(request: MCPRequest):
         params = request.params
         
         if method == "tools/list":
-            return MCPResponse(
+            response = MCPResponse(
                 result={"tools": await get_available_tools()},
                 id=request.id
             )
@@ -98,18 +189,21 @@ async def handle_mcp_request(request: MCPRequest):
             tool_name = params.get("name")
             tool_args = params.get("arguments", {})
             result = await call_tool(tool_name, tool_args)
-            return MCPResponse(result=result, id=request.id)
+            response = MCPResponse(result=result, id=request.id)
         else:
-            return MCPResponse(
+            response = MCPResponse(
                 error={"code": -32601, "message": f"Unknown method: {method}"},
                 id=request.id
             )
     except Exception as e:
         logger.error(f"Error handling MCP request: {e}")
-        return MCPResponse(
+        response = MCPResponse(
             error={"code": -32603, "message": str(e)},
             id=request.id
         )
+    
+    # Render directly so NumPy results skip pydantic's per-element JSON encoding
+    return ORJSONResponse(response.model_dump())
 
 async def get_available_tools() -> List[Dict[str, Any]]:
     """Get list of available MCP tools"""
@@ -124,18 +218,41 @@ async def get_available_tools() -> List[Dict[str, Any]]:
                         "type": "array",
                         "description": "KV cache as nested arrays"
                     },
+                    "kv_cache_fp16_b64": {
+                        "type": "string",
+                        "description": "KV cache as a base64 float16 buffer (response is returned the same way)"
+                    },
+                    "kv_cache_int8_b64": {
+                        "type": "string",
+                        "description": "KV cache as a base64 int8 buffer quantized per row"
+                    },
+                    "kv_scales_b64": {
+                        "type": "string",
+                        "description": "Per-row float32 scales for kv_cache_int8_b64, base64 encoded"
+                    },
+                    "kv_shape": {
+                        "type": "array",
+                        "description": "Shape [tokens, dims] of a binary KV cache"
+                    },
                     "sink_tokens": {
                         "type": "integer",
                         "description": "Number of sink tokens to preserve",
-                        "default": 10
+                        "default": 10,
+                        "minimum": 0
                     },
                     "compression_ratio": {
                         "type": "number",
                         "description": "Target compression ratio",
-                        "default": 0.5
+                        "default": 0.5,
+                        "exclusiveMinimum": 0,
+                        "maximum": 1
                     }
                 },
-                "required": ["kv_cache"]
+                "anyOf": [
+                    {"required": ["kv_cache"]},
+                    {"required": ["kv_cache_fp16_b64", "kv_shape"]},
+                    {"required": ["kv_cache_int8_b64", "kv_scales_b64", "kv_shape"]}
+                ]
             }
         },
         {
@@ -197,26 +314,39 @@ async def call_tool(tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
 
 async def compress_kv_cache(args: Dict[str, Any]) -> Dict[str, Any]:
     """Compress KV cache using FreqKV and LoCoCo"""
-    kv_cache = args["kv_cache"]
-    sink_tokens = args.get("sink_tokens", 10)
-    compression_ratio = args.get("compression_ratio", 0.5)
+    request = KVCompressionRequest(**args)
     
-    # Apply FreqKV compression
-    freq_compressed = await freqkv_service.compress(
-        kv_cache, sink_tokens=sink_tokens
-    )
+    # Convert once at the boundary; both services operate on the array directly.
+    # Binary payloads are upcast to float32 here and answered in float16.
+    binary = True
+    if request.kv_cache_fp16_b64 is not None and request.kv_shape:
+        kv_array = decode_fp16_b64(request.kv_cache_fp16_b64, request.kv_shape)
+    elif request.kv_cache_int8_b64 is not None and request.kv_scales_b64 is not None and request.kv_shape:
+        kv_array = decode_int8_b64(request.kv_cache_int8_b64, request.kv_scales_b64, request.kv_shape)
+    elif request.kv_cache is not None:
+        kv_array = request.kv_cache
+        binary = False
+    else:
+        raise ValueError("kv_cache, or a binary KV cache with kv_shape, is required")
     
-    # Apply LoCoCo fusion
-    final_compressed = await lococo_service.fuse(
-        freq_compressed, target_ratio=compression_ratio
+    # Apply fused FreqKV compression and LoCoCo fusion, batched with concurrent requests
+    final_compressed = await compression_batcher.submit(
+        (kv_array, request.sink_tokens, request.compression_ratio)
     )
     
-    return {
-        "compressed_kv": final_compressed,
-        "original_size": len(kv_cache),
+    result = {
+        "original_size": len(kv_array),
         "compressed_size": len(final_compressed),
-        "compression_ratio": len(final_compressed) / len(kv_cache)
+        "compression_ratio": len(final_compressed) / len(kv_array)
     }
+    if binary:
+        result["compressed_kv_fp16_b64"] = encode_fp16_b64(final_compressed)
+        result["compressed_shape"] = list(final_compressed.shape)
+    else:
+        # Serialized by ORJSONResponse without a Python list round-trip
+        result["compressed_kv"] = final_compressed
+    
+    return result
 
 async def route_prompt(args: Dict[str, Any]) -> Dict[str, Any]:
     """Route prompt to appropriate model"""
@@ -225,14 +355,15 @@ async def route_prompt(args: Dict[str, Any]) -> Dict[str, Any]:
     max_tokens = args.get("max_tokens")
     
     # Classify prompt complexity
-    complexity = await routing_service.classify_complexity(prompt, context)
+    complexity = await routing_service.classify_complexity_async(prompt, context)
     
     # Get model for complexity level
     model_endpoint = model_registry.get_model_for_complexity(complexity)
     
     # Generate response using selected model
     response = await routing_service.generate_response(
-        prompt, model_endpoint, context=context, max_tokens=max_tokens
+        prompt, model_endpoint, context=context, max_tokens=max_tokens,
+        complexity=complexity
     )
     
     return {
@@ -0,0 +1,121 @@
+"""
+Micro-batcher - Coalesces concurrent requests into batches
+"""
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """Collects items submitted within a short time window and processes them together"""
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch: int = 32,
+        max_wait_ms: float = 10.0,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Args:
+            process_batch: Function mapping a list of items to a list of
+                results in the same order; runs on the executor. A result that
+                is an Exception instance fails only that item's request
+            max_batch: Maximum number of items processed together
+            max_wait_ms: How long to wait for more items after the first one
+            executor: Executor for process_batch (default: the loop's default executor)
+        """
+        self.process_batch = process_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    def start(self):
+        """Start the background batching task if it is not already running"""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the background task, finish in-flight batches and cancel queued requests"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # Let batches already handed to the executor finish
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item for the next batch and wait for its result"""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _run(self):
+        """Drain the queue every max_wait seconds or once max_batch items arrive"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = []
+            try:
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.max_wait
+
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Stopped while collecting: these requests have already left the queue
+                for _, future in batch:
+                    if not future.done():
+                        future.cancel()
+                raise
+
+            # Dispatch without waiting so the next batch can run on another worker
+            dispatch = loop.create_task(self._dispatch(batch))
+            self._inflight.add(dispatch)
+            dispatch.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]):
+        """Process one batch and resolve the futures of its submitters"""
+        items = [item for item, _ in batch]
+
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.process_batch, items
+            )
+        except Exception as e:
+            logger.error(f"Batch of {len(items)} items failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
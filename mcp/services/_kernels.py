@@ -0,0 +1,61 @@
+"""
+Compiled numeric kernels for the KV cache services
+
+Numba is optional: when it is not installed NUMBA_AVAILABLE is False and
+the services fall back to their NumPy implementations.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Keep the JIT cache outside the package so compilation is a one-time cost
+# even when the install directory is read-only
+os.environ.setdefault(
+    "NUMBA_CACHE_DIR", str(Path(tempfile.gettempdir()) / "globalmcp-numba")
+)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def moving_avg_strided(cache, kernel_size, stride, out):
+        """
+        Strided moving average along the sequence axis
+
+        Writes the mean of window ``cache[t * stride:t * stride + kernel_size]``
+        into ``out[t]`` for every row of ``out``. A running sum over whole
+        feature rows keeps memory access contiguous and the cost O(N * D)
+        regardless of kernel size.
+        """
+        n_out = out.shape[0]
+        n_dims = cache.shape[1]
+        inv = 1.0 / kernel_size
+        s = np.zeros(n_dims)
+
+        for i in range(kernel_size):
+            for j in range(n_dims):
+                s[j] += cache[i, j]
+        if n_out > 0:
+            for j in range(n_dims):
+                out[0, j] = s[j] * inv
+
+        start = 0
+        for t in range(1, n_out):
+            end = t * stride
+            for i in range(start, end):
+                for j in range(n_dims):
+                    s[j] += cache[i + kernel_size, j] - cache[i, j]
+            start = end
+            for j in range(n_dims):
+                out[t, j] = s[j] * inv
+
+else:
+    moving_avg_strided = None
@@ -3,33 +3,44 @@ FreqKV Service - Frequency-domain KV cache compression using DCT
 """
 import numpy as np
 from scipy.fft import dct, idct
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
 class FreqKVService:
     """Service for compressing KV cache using frequency-domain filtering (DCT)"""
     
-    def __init__(self, default_compression_ratio: float = 0.7):
+    # Sequences up to this length use a cached DCT basis matmul instead of SciPy
+    BASIS_MAX_TOKENS = 32
+    
+    def __init__(
+        self,
+        default_compression_ratio: float = 0.7,
+        fft_workers: Optional[int] = None
+    ):
         self.default_compression_ratio = default_compression_ratio
+        # Resolved once so every transform reuses the same pocketfft thread count
+        self.fft_workers = fft_workers or os.cpu_count() or 1
+        self._basis_cache: Dict[Tuple[int, np.dtype], np.ndarray] = {}
         
-    async def compress(
+    def compress(
         self, 
-        kv_cache: List[List[float]], 
+        kv_cache: Union[np.ndarray, List[List[float]]], 
         sink_tokens: int = 10,
         compression_ratio: float = None
-    ) -> List[List[float]]:
+    ) -> Union[np.ndarray, List[List[float]]]:
         """
         Compress KV cache using DCT-based frequency filtering
         
         Args:
-            kv_cache: Input KV cache as nested lists
+            kv_cache: Input KV cache as a 2-D array or nested lists
             sink_tokens: Number of initial tokens to preserve uncompressed
             compression_ratio: Fraction of frequencies to keep (default uses instance setting)
             
         Returns:
-            Compressed KV cache
+            Compressed KV cache, as an array if given an array, nested lists otherwise
         """
         if compression_ratio is None:
             compression_ratio = self.default_compression_ratio
@@ -40,48 +51,87 @@ class FreqKVService:
             logger.warning("KV cache smaller than sink tokens, returning unchanged")
             return kv_cache
             
-        # Convert to numpy array for processing
-        kv_array = np.array(kv_cache, dtype=np.float32)
+        # Arrays are used as-is; nested lists are converted once here
+        is_array = isinstance(kv_cache, np.ndarray)
+        kv_array = kv_cache if is_array else np.array(kv_cache, dtype=np.float32)
         
-        # Preserve sink tokens
-        sink_cache = kv_array[:sink_tokens]
-        compressible_cache = kv_array[sink_tokens:]
+        # Write sink tokens and compressed tokens into one preallocated buffer
+        n_keep = self.compressed_length(len(kv_array) - sink_tokens, compression_ratio)
+        result_cache = np.empty((sink_tokens + n_keep, kv_array.shape[1]), dtype=kv_array.dtype)
+        result_cache[:sink_tokens] = kv_array[:sink_tokens]
         
         # Apply DCT compression to each dimension
-        compressed_cache = self._apply_dct_compression(
-            compressible_cache, compression_ratio
+        self.apply_dct_compression(
+            kv_array[sink_tokens:], compression_ratio, out=result_cache[sink_tokens:]
         )
         
-        # Combine sink tokens with compressed cache
-        result_cache = np.vstack([sink_cache, compressed_cache])
-        
         logger.info(f"Compression complete: {len(kv_cache)} -> {len(result_cache)} tokens")
         
-        return result_cache.tolist()
+        return result_cache if is_array else result_cache.tolist()
     
-    def _apply_dct_compression(
+    def compressed_length(self, n_tokens: int, compression_ratio: float) -> int:
+        """Number of DCT coefficients (and output tokens) kept for n_tokens"""
+        return min(int(n_tokens * compression_ratio), n_tokens)
+    
+    def apply_dct_compression(
         self, 
         cache: np.ndarray, 
-        compression_ratio: float
+        compression_ratio: float,
+        out: Optional[np.ndarray] = None
     ) -> np.ndarray:
-        """Apply DCT-based compression to cache array"""
+        """
+        Apply DCT-based compression to cache array
         
-        # Apply DCT along sequence dimension
-        dct_coeffs = dct(cache, axis=0, norm='ortho')
+        Low-level building block for compress and CompressionPipeline: every
+        token is compressed, with no sink-token handling or logging. The
+        sequence axis is the second-to-last one, so both a single
+        (tokens, dims) cache and a stacked (batch, tokens, dims) batch work.
+        The result is written into out when given, otherwise a new array.
+        """
         
         # Determine how many coefficients to keep
-        n_tokens, n_dims = cache.shape
-        n_keep = int(n_tokens * compression_ratio)
+        n_tokens = cache.shape[-2]
+        n_keep = self.compressed_length(n_tokens, compression_ratio)
         
-        # Zero out high-frequency components
-        compressed_coeffs = dct_coeffs.copy()
-        compressed_coeffs[n_keep:] = 0
+        if out is None:
+            out = np.empty(cache.shape[:-2] + (n_keep, cache.shape[-1]), dtype=cache.dtype)
         
-        # Apply inverse DCT to reconstruct
-        reconstructed = idct(compressed_coeffs, axis=0, norm='ortho')
+        if n_keep == n_tokens:
+            # Keeping every coefficient reconstructs the input unchanged
+            out[...] = cache
+        elif n_keep == 0:
+            pass
+        else:
+            # An orthonormal inverse of length n_keep scales the signal by
+            # sqrt(n_tokens / n_keep); rescale so amplitudes are preserved
+            scale = np.sqrt(n_keep / n_tokens)
+            
+            if n_tokens <= self.BASIS_MAX_TOKENS:
+                # Short sequences: two small matmuls beat SciPy's per-call dispatch
+                coeffs = self._dct_basis(n_tokens, cache.dtype)[:n_keep] @ cache
+                coeffs *= scale
+                np.matmul(self._dct_basis(n_keep, cache.dtype).T, coeffs, out=out)
+            else:
+                # Keep only the low-frequency DCT coefficients along the sequence
+                # dimension and reconstruct directly at the compressed length
+                coeffs = dct(cache, axis=-2, norm='ortho', workers=self.fft_workers)[..., :n_keep, :]
+                coeffs *= scale
+                out[...] = idct(coeffs, n=n_keep, axis=-2, norm='ortho', workers=self.fft_workers)
         
-        # Ensure we only return the compressed number of tokens
-        return reconstructed[:n_keep]
+        return out
+    
+    def _dct_basis(self, n: int, dtype: np.dtype) -> np.ndarray:
+        """Orthonormal DCT-II matrix of size n, cached per size and dtype"""
+        key = (n, np.dtype(dtype))
+        basis = self._basis_cache.get(key)
+        if basis is None:
+            k = np.arange(n)[:, None]
+            i = np.arange(n)[None, :]
+            basis = np.sqrt(2.0 / n) * np.cos(np.pi / n * (i + 0.5) * k)
+            basis[0] /= np.sqrt(2.0)
+            basis = basis.astype(dtype)
+            self._basis_cache[key] = basis
+        return basis
     
     def get_compression_stats(
         self, 
@@ -2,9 +2,11 @@
 LoCoCo Service - Convolution-based KV fusion for context compression
 """
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
 import logging
 
+from ._kernels import NUMBA_AVAILABLE, moving_avg_strided
+
 logger = logging.getLogger(__name__)
 
 class LoCoCoService:
@@ -13,25 +15,27 @@ class LoCoCoService:
     def __init__(self, default_kernel_size: int = 7, default_target_size: int = 256):
         self.default_kernel_size = default_kernel_size
         self.default_target_size = default_target_size
+        self._kernel = np.full(default_kernel_size, 1.0 / default_kernel_size, dtype=np.float32)
         
-    async def fuse(
+    def fuse(
         self,
-        kv_cache: List[List[float]],
+        kv_cache: Union[np.ndarray, List[List[float]]],
         target_ratio: float = 0.5,
         kernel_size: int = None,
         target_size: int = None
-    ) -> List[List[float]]:
+    ) -> Union[np.ndarray, List[List[float]]]:
         """
         Fuse KV cache using 1D convolution to reduce sequence length
         
         Args:
-            kv_cache: Input KV cache as nested lists
+            kv_cache: Input KV cache as a 2-D array or nested lists
             target_ratio: Target compression ratio (0.5 = half the size)
             kernel_size: Convolution kernel size (default uses instance setting)
             target_size: Explicit target size (overrides target_ratio)
             
         Returns:
-            Fused KV cache with reduced sequence length
+            Fused KV cache with reduced sequence length, as an array if given
+            an array, nested lists otherwise
         """
         if kernel_size is None:
             kernel_size = self.default_kernel_size
@@ -41,8 +45,9 @@ class LoCoCoService:
         if len(kv_cache) == 0:
             return kv_cache
             
-        # Convert to numpy array
-        kv_array = np.array(kv_cache, dtype=np.float32)
+        # Arrays are used as-is; nested lists are converted once here
+        is_array = isinstance(kv_cache, np.ndarray)
+        kv_array = kv_cache if is_array else np.array(kv_cache, dtype=np.float32)
         n_tokens, n_dims = kv_array.shape
         
         # Determine target size
@@ -57,57 +62,79 @@ class LoCoCoService:
             return kv_cache
             
         # Apply convolution-based fusion
-        fused_cache = self._apply_convolution_fusion(
+        fused_cache = self.apply_convolution_fusion(
             kv_array, target_size, kernel_size
         )
         
         logger.info(f"Fusion complete: {n_tokens} -> {len(fused_cache)} tokens")
         
-        return fused_cache.tolist()
+        return fused_cache if is_array else fused_cache.tolist()
+    
+    def fusion_layout(
+        self,
+        n_tokens: int,
+        target_size: int,
+        kernel_size: int
+    ) -> Tuple[int, int, int]:
+        """
+        Plan a fusion of n_tokens down to target_size
+        
+        Returns:
+            Tuple of (stride, number of averaged windows, total fused tokens)
+        """
+        # Calculate stride to achieve target size
+        stride = max(1, n_tokens // target_size)
+        
+        # Number of full windows, then strided raw tokens to pad up to target_size
+        if n_tokens >= kernel_size:
+            n_windows = min(target_size, (n_tokens - kernel_size) // stride + 1)
+        else:
+            n_windows = 0
+        n_padding = min(target_size - n_windows, len(range(n_windows * stride, n_tokens, stride)))
+        
+        return stride, n_windows, n_windows + n_padding
     
-    def _apply_convolution_fusion(
+    def apply_convolution_fusion(
         self, 
         cache: np.ndarray, 
         target_size: int, 
-        kernel_size: int
+        kernel_size: int,
+        out: Optional[np.ndarray] = None
     ) -> np.ndarray:
-        """Apply convolution-based fusion to reduce sequence length"""
-        
-        n_tokens, n_dims = cache.shape
+        """
+        Apply convolution-based fusion to reduce sequence length
         
-        # Calculate stride to achieve target size
-        stride = max(1, n_tokens // target_size)
+        Low-level building block for fuse and CompressionPipeline, without
+        target-size resolution or logging. The result is written into out when given (sized per fusion_layout),
+        otherwise a new array.
+        """
         
-        # Create averaging kernel
-        kernel = np.ones(kernel_size) / kernel_size
+        n_tokens, n_dims = cache.shape
+        stride, n_windows, n_fused = self.fusion_layout(n_tokens, target_size, kernel_size)
         
-        # Apply 1D convolution along sequence dimension for each feature
-        fused_tokens = []
+        if out is None:
+            out = np.empty((n_fused, n_dims), dtype=cache.dtype)
         
-        for i in range(0, n_tokens - kernel_size + 1, stride):
-            if len(fused_tokens) >= target_size:
-                break
-                
-            # Extract window
-            window = cache[i:i + kernel_size]
-            
-            # Apply kernel (weighted average)
-            fused_token = np.average(window, axis=0, weights=kernel[:len(window)])
-            fused_tokens.append(fused_token)
-        
-        # Ensure we have exactly target_size tokens
-        while len(fused_tokens) < target_size and len(fused_tokens) < n_tokens:
-            # Add remaining tokens if needed
-            remaining_start = len(fused_tokens) * stride
-            if remaining_start < n_tokens:
-                fused_tokens.append(cache[remaining_start])
+        # Uniform averaging kernel: the fusion is a strided moving average
+        if n_windows > 0:
+            if NUMBA_AVAILABLE:
+                moving_avg_strided(cache, kernel_size, stride, out[:n_windows])
             else:
-                break
-                
-        # Trim to exact target size
-        fused_tokens = fused_tokens[:target_size]
+                kernel = self._averaging_kernel(kernel_size, cache.dtype)
+                windows = np.lib.stride_tricks.sliding_window_view(cache, kernel_size, axis=0)
+                np.einsum('k,ndk->nd', kernel, windows[::stride][:n_windows], out=out[:n_windows])
+        
+        out[n_windows:] = cache[n_windows * stride::stride][:n_fused - n_windows]
         
-        return np.array(fused_tokens)
+        return out
+    
+    def _averaging_kernel(self, kernel_size: int, dtype: np.dtype) -> np.ndarray:
+        """Uniform averaging kernel, rebuilt only when the size or dtype changes"""
+        kernel = self._kernel
+        if kernel.shape[0] != kernel_size or kernel.dtype != dtype:
+            kernel = np.full(kernel_size, 1.0 / kernel_size, dtype=dtype)
+            self._kernel = kernel
+        return kernel
     
     def get_fusion_stats(
         self,
@@ -0,0 +1,93 @@
+"""
+Compression Pipeline - Fused FreqKV compression and LoCoCo fusion
+"""
+import numpy as np
+from typing import List, Union
+import logging
+
+from .freqkv_service import FreqKVService
+from .lococo_service import LoCoCoService
+
+logger = logging.getLogger(__name__)
+
+class CompressionPipeline:
+    """Runs FreqKV compression followed by LoCoCo fusion in a single pass"""
+
+    def __init__(self, freqkv: FreqKVService, lococo: LoCoCoService):
+        self.freqkv = freqkv
+        self.lococo = lococo
+
+    def compress_and_fuse(
+        self,
+        kv_cache: Union[np.ndarray, List[List[float]]],
+        sink_tokens: int = 10,
+        freq_ratio: float = None,
+        target_ratio: float = 0.5,
+        kernel_size: int = None
+    ) -> Union[np.ndarray, List[List[float]]]:
+        """
+        Compress and fuse a KV cache without materializing the FreqKV result
+
+        Sink tokens are copied straight into the output buffer. The DCT-compressed
+        tokens are reconstructed into a scratch buffer, which the fusion kernel
+        reads to write the fused tokens directly into the output tail.
+
+        Args:
+            kv_cache: Input KV cache as a 2-D array, a stacked (batch, tokens, dims)
+                array of same-shaped caches, or nested lists
+            sink_tokens: Number of initial tokens to preserve uncompressed
+            freq_ratio: Fraction of frequencies to keep (default uses FreqKV setting)
+            target_ratio: Fraction of compressed tokens kept after fusion
+            kernel_size: Convolution kernel size (default uses LoCoCo setting)
+
+        Returns:
+            Sink tokens followed by the fused tokens, as an array if given an
+            array, nested lists otherwise
+        """
+        if freq_ratio is None:
+            freq_ratio = self.freqkv.default_compression_ratio
+        if kernel_size is None:
+            kernel_size = self.lococo.default_kernel_size
+
+        is_array = isinstance(kv_cache, np.ndarray)
+        kv_array = kv_cache if is_array else np.array(kv_cache, dtype=np.float32)
+        n_tokens = kv_array.shape[-2] if kv_array.ndim >= 2 else len(kv_array)
+
+        logger.info(f"Compressing and fusing KV cache: {n_tokens} tokens, {sink_tokens} sink tokens")
+
+        if n_tokens <= sink_tokens:
+            logger.warning("KV cache smaller than sink tokens, returning unchanged")
+            return kv_cache
+
+        n_keep = self.freqkv.compressed_length(n_tokens - sink_tokens, freq_ratio)
+        target_size = max(1, int(n_keep * target_ratio))
+        fuse = n_keep > target_size
+        if fuse:
+            _, _, n_out = self.lococo.fusion_layout(n_keep, target_size, kernel_size)
+        else:
+            n_out = n_keep
+
+        result = np.empty(
+            kv_array.shape[:-2] + (sink_tokens + n_out, kv_array.shape[-1]), dtype=kv_array.dtype
+        )
+        result[..., :sink_tokens, :] = kv_array[..., :sink_tokens, :]
+
+        compressible = kv_array[..., sink_tokens:, :]
+        if not fuse:
+            # Nothing to fuse: reconstruct straight into the output tail
+            self.freqkv.apply_dct_compression(
+                compressible, freq_ratio, out=result[..., sink_tokens:, :]
+            )
+        else:
+            scratch = self.freqkv.apply_dct_compression(compressible, freq_ratio)
+            for scratch_cache, result_cache in zip(
+                scratch.reshape(-1, n_keep, scratch.shape[-1]),
+                result.reshape(-1, sink_tokens + n_out, result.shape[-1])
+            ):
+                self.lococo.apply_convolution_fusion(
+                    scratch_cache, target_size, kernel_size, out=result_cache[sink_tokens:]
+                )
+
+        logger.info(f"Compression and fusion complete: {n_tokens} -> {sink_tokens + n_out} tokens")
+
+        return result if is_array else result.tolist()
@@ -3,15 +3,47 @@ Routing Service - Prompt complexity classification and model routing
 """
 import re
 import asyncio
+import hashlib
 import httpx
-from typing import Dict, Any, Optional
+import numpy as np
+from collections import Counter, OrderedDict
+from typing import Dict, Any, List, Optional
 import logging
 
+# RE2 matches in linear time regardless of pattern shape; optional
+try:
+    import re2
+except ImportError:
+    re2 = None
+
 logger = logging.getLogger(__name__)
 
+_WORD_RE = re.compile(r"\w+")
+# Patterns of the form \b(word|word|...)\b, which reduce to whole-word lookups
+_LITERAL_PATTERN_RE = re.compile(r"^\\b\(([\w|]+)\)\\b$")
+
+_LEVELS = ("simple", "moderate", "complex")
+
+# Heuristic keyword sets, matched as whole words
+_TECHNICAL_KEYWORDS = frozenset([
+    "algorithm", "architecture", "framework", "library", "protocol",
+    "asynchronous", "concurrent", "distributed", "microservice",
+    "authentication", "authorization", "encryption", "validation"
+])
+_CODE_INDICATORS = frozenset(["class", "function", "method", "interface", "enum", "struct"])
+
+def _compile_pattern(pattern: str):
+    """Compile a case-insensitive pattern, using RE2 when installed"""
+    if re2 is not None:
+        return re2.compile(f"(?i){pattern}")
+    return re.compile(pattern, re.IGNORECASE)
+
 class RoutingService:
     """Service for classifying prompt complexity and routing to appropriate models"""
     
+    # Texts longer than this are classified on a worker thread by classify_complexity_async
+    _THREAD_THRESHOLD = 10_000
+    
     def __init__(self):
         self.complexity_patterns = {
             "simple": [
@@ -35,7 +67,44 @@ class RoutingService:
             ]
         }
         
-    async def classify_complexity(
+        # Plain word alternations become one dictionary lookup per prompt word;
+        # the remaining patterns are precompiled and counted one by one, since
+        # fusing them into one alternation would let a greedy ".*" branch
+        # swallow the matches of the patterns after it
+        self._keyword_levels: Dict[str, str] = {}
+        self._residual_patterns: Dict[str, List[Any]] = {}
+        for complexity, patterns in self.complexity_patterns.items():
+            residual_patterns = []
+            for pattern in patterns:
+                literal = _LITERAL_PATTERN_RE.match(pattern)
+                if literal:
+                    for keyword in literal.group(1).split("|"):
+                        self._keyword_levels[keyword] = complexity
+                else:
+                    residual_patterns.append(pattern)
+            self._residual_patterns[complexity] = [
+                _compile_pattern(pattern) for pattern in residual_patterns
+            ]
+        
+        # Every word that can contribute a moderate or complex score; prompts of
+        # at most three words containing none of them are always simple
+        self._nontrivial_hints = frozenset(
+            word
+            for complexity in ("moderate", "complex")
+            for pattern in self.complexity_patterns[complexity]
+            for word in _WORD_RE.findall(pattern.lower())
+        ) | _TECHNICAL_KEYWORDS | _CODE_INDICATORS
+        
+        # Shared HTTP client, created on first use so connections are kept alive
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_lock = asyncio.Lock()
+        
+        # LRU cache of recent classifications, least recently used first. Keyed
+        # by a digest of the input so large prompts aren't kept alive by the cache
+        self._classify_cache: OrderedDict[bytes, str] = OrderedDict()
+        self._cache_max = 4096
+        
+    def classify_complexity(
         self, 
         prompt: str, 
         context: str = ""
@@ -50,20 +119,19 @@ class RoutingService:
         Returns:
             Complexity level: "simple", "moderate", or "complex"
         """
-        full_text = f"{prompt} {context}".lower()
-        
-        # Count pattern matches for each complexity level
-        complexity_scores = {}
-        
-        for complexity, patterns in self.complexity_patterns.items():
-            score = 0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, full_text, re.IGNORECASE))
-                score += matches
-            complexity_scores[complexity] = score
+        cache_key = hashlib.blake2b(f"{prompt}\x00{context}".encode(), digest_size=16).digest()
+        cached = self._classify_cache.get(cache_key)
+        if cached is not None:
+            try:
+                self._classify_cache.move_to_end(cache_key)
+            except KeyError:
+                # Evicted concurrently by a classification on another thread
+                pass
+            return cached
         
-        # Add heuristic scoring
-        complexity_scores = self._add_heuristic_scores(full_text, complexity_scores)
+        complexity_scores = self._score(f"{prompt} {context}".lower())
+        if complexity_scores is None:
+            return "simple"
         
         # Determine final complexity
         if complexity_scores["complex"] > 0:
@@ -73,18 +141,112 @@ class RoutingService:
         else:
             classification = "simple"
             
-        logger.info(f"Classified prompt as '{classification}' (scores: {complexity_scores})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Classified prompt as '%s' (scores: %s)", classification, complexity_scores)
+        
+        self._classify_cache[cache_key] = classification
+        if len(self._classify_cache) > self._cache_max:
+            self._classify_cache.popitem(last=False)
+        
         return classification
     
+    def classify_many(
+        self,
+        prompts: List[str],
+        contexts: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Classify a batch of prompts
+        
+        Scores for the whole batch are collected into one array and resolved
+        to complexity levels together. Results are not cached.
+        
+        Args:
+            prompts: The prompts to classify
+            contexts: Additional context for each prompt (default: none)
+            
+        Returns:
+            Complexity level for each prompt, in order
+            
+        Raises:
+            ValueError: If contexts is given with a different length than prompts
+        """
+        if contexts is None:
+            contexts = [""] * len(prompts)
+        elif len(contexts) != len(prompts):
+            raise ValueError(
+                f"Got {len(contexts)} contexts for {len(prompts)} prompts"
+            )
+        
+        # Columns follow _LEVELS: simple, moderate, complex
+        scores = np.zeros((len(prompts), len(_LEVELS)), dtype=np.int32)
+        for i, (prompt, context) in enumerate(zip(prompts, contexts)):
+            prompt_scores = self._score(f"{prompt} {context or ''}".lower())
+            if prompt_scores is not None:
+                scores[i] = [prompt_scores[level] for level in _LEVELS]
+        
+        # Any complex score wins; otherwise moderate must outscore simple
+        resolved = np.where(
+            scores[:, 2] > 0, 2, np.where(scores[:, 1] > scores[:, 0], 1, 0)
+        )
+        return [_LEVELS[i] for i in resolved]
+    
+    def _score(self, full_text: str) -> Optional[Dict[str, int]]:
+        """
+        Score lowercased text against each complexity level
+        
+        Returns:
+            Score per complexity level, or None for trivial texts that are
+            always simple
+        """
+        # Whitespace-separated words drive the length heuristic; \w+ tokens
+        # are only used for keyword lookups
+        word_count = len(full_text.split())
+        words = _WORD_RE.findall(full_text)
+        
+        # Trivial prompts skip the pattern scan entirely
+        if word_count <= 3 and self._nontrivial_hints.isdisjoint(words):
+            return None
+        
+        # Count pattern matches for each complexity level
+        complexity_scores = {complexity: 0 for complexity in self.complexity_patterns}
+        
+        # Map and count in C: non-keywords map to None and are filtered out
+        keyword_hits = Counter(filter(None, map(self._keyword_levels.get, words)))
+        for complexity in complexity_scores:
+            complexity_scores[complexity] += keyword_hits[complexity]
+        
+        for complexity, patterns in self._residual_patterns.items():
+            for pattern in patterns:
+                complexity_scores[complexity] += sum(1 for _ in pattern.finditer(full_text))
+        
+        # Add heuristic scoring
+        return self._add_heuristic_scores(word_count, words, complexity_scores)
+    
+    async def classify_complexity_async(
+        self,
+        prompt: str,
+        context: str = ""
+    ) -> str:
+        """
+        Classify prompt complexity without blocking the event loop on long texts
+        
+        Short texts are classified inline; texts over _THREAD_THRESHOLD
+        characters run on the default executor.
+        """
+        if len(prompt) + len(context or "") > self._THREAD_THRESHOLD:
+            return await asyncio.to_thread(self.classify_complexity, prompt, context)
+        return self.classify_complexity(prompt, context)
+    
     def _add_heuristic_scores(
         self, 
-        text: str, 
+        word_count: int,
+        words: List[str], 
         scores: Dict[str, int]
     ) -> Dict[str, int]:
         """Add heuristic-based scoring to complexity classification"""
         
         # Length-based heuristics
-        word_count = len(text.split())
         if word_count > 100:
             scores["complex"] += 2
         elif word_count > 50:
@@ -93,35 +255,47 @@ class RoutingService:
             scores["simple"] += 1
             
         # Technical keyword density
-        technical_keywords = [
-            "algorithm", "architecture", "framework", "library", "protocol",
-            "asynchronous", "concurrent", "distributed", "microservice",
-            "authentication", "authorization", "encryption", "validation"
-        ]
-        
-        tech_score = sum(1 for keyword in technical_keywords if keyword in text)
+        word_set = frozenset(words)
+        tech_score = len(word_set & _TECHNICAL_KEYWORDS)
         if tech_score >= 3:
             scores["complex"] += tech_score
         elif tech_score >= 1:
             scores["moderate"] += tech_score
             
         # Code complexity indicators
-        code_indicators = ["class", "function", "method", "interface", "enum", "struct"]
-        code_score = sum(1 for indicator in code_indicators if indicator in text)
+        code_score = len(word_set & _CODE_INDICATORS)
         
-        if code_score >= 3:
-            scores["moderate"] += 1
-        elif code_score >= 5:
+        if code_score >= 5:
             scores["complex"] += 1
+        elif code_score >= 3:
+            scores["moderate"] += 1
             
         return scores
     
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use"""
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.AsyncClient(
+                        timeout=httpx.Timeout(30.0, connect=5.0),
+                        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+                    )
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     async def generate_response(
         self,
         prompt: str,
         model_endpoint: str,
         context: str = "",
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        complexity: Optional[str] = None
     ) -> str:
         """
         Generate response using the specified model endpoint
@@ -131,6 +305,8 @@ class RoutingService:
             model_endpoint: Model endpoint URL or identifier
             context: Additional context
             max_tokens: Maximum tokens for response
+            complexity: Complexity already determined by the caller; lets mock
+                responses skip classifying the prompt again
             
         Returns:
             Generated response text
@@ -139,7 +315,7 @@ class RoutingService:
             # If model_endpoint is an Ollama model identifier
             if model_endpoint.startswith("ollama://"):
                 return await self._generate_ollama_response(
-                    prompt, model_endpoint, context, max_tokens
+                    prompt, model_endpoint, context, max_tokens, complexity
                 )
             # If it's a direct HTTP endpoint
             elif model_endpoint.startswith("http"):
@@ -149,7 +325,7 @@ class RoutingService:
             else:
                 # Mock response for unsupported endpoints
                 logger.warning(f"Unsupported model endpoint: {model_endpoint}")
-                return await self._generate_mock_response(prompt, model_endpoint)
+                return await self._generate_mock_response(prompt, model_endpoint, complexity)
                 
         except Exception as e:
             logger.error(f"Error generating response with {model_endpoint}: {e}")
@@ -160,36 +336,36 @@ class RoutingService:
         prompt: str,
         model_endpoint: str,
         context: str,
-        max_tokens: Optional[int]
+        max_tokens: Optional[int],
+        complexity: Optional[str] = None
     ) -> str:
         """Generate response using Ollama API"""
         model_name = model_endpoint.replace("ollama://", "")
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "http://localhost:11434/api/generate",
-                    json={
-                        "model": model_name,
-                        "prompt": f"{context}\n\n{prompt}" if context else prompt,
-                        "stream": False,
-                        "options": {
-                            "num_predict": max_tokens or 512
-                        }
-                    },
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    return result.get("response", "No response generated")
-                else:
-                    logger.error(f"Ollama API error: {response.status_code}")
-                    return f"Ollama API error: {response.status_code}"
+            client = await self._get_client()
+            response = await client.post(
+                "http://localhost:11434/api/generate",
+                json={
+                    "model": model_name,
+                    "prompt": f"{context}\n\n{prompt}" if context else prompt,
+                    "stream": False,
+                    "options": {
+                        "num_predict": max_tokens or 512
+                    }
+                }
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                return result.get("response", "No response generated")
+            else:
+                logger.error(f"Ollama API error: {response.status_code}")
+                return f"Ollama API error: {response.status_code}"
                     
         except httpx.ConnectError:
             logger.warning("Ollama not available, returning mock response")
-            return await self._generate_mock_response(prompt, model_endpoint)
+            return await self._generate_mock_response(prompt, model_endpoint, complexity)
         except Exception as e:
             logger.error(f"Ollama request failed: {e}")
             return f"Ollama request failed: {e}"
@@ -203,29 +379,34 @@ class RoutingService:
     ) -> str:
         """Generate response using generic HTTP endpoint"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    model_endpoint,
-                    json={
-                        "prompt": f"{context}\n\n{prompt}" if context else prompt,
-                        "max_tokens": max_tokens or 512
-                    },
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    return result.get("response", result.get("text", "No response"))
-                else:
-                    return f"HTTP API error: {response.status_code}"
+            client = await self._get_client()
+            response = await client.post(
+                model_endpoint,
+                json={
+                    "prompt": f"{context}\n\n{prompt}" if context else prompt,
+                    "max_tokens": max_tokens or 512
+                }
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                return result.get("response", result.get("text", "No response"))
+            else:
+                return f"HTTP API error: {response.status_code}"
                     
         except Exception as e:
             logger.error(f"HTTP request failed: {e}")
             return f"HTTP request failed: {e}"
     
-    async def _generate_mock_response(self, prompt: str, model_endpoint: str) -> str:
+    async def _generate_mock_response(
+        self,
+        prompt: str,
+        model_endpoint: str,
+        complexity: Optional[str] = None
+    ) -> str:
         """Generate mock response for testing/demo purposes"""
-        complexity = await self.classify_complexity(prompt)
+        if complexity is None:
+            complexity = self.classify_complexity(prompt)
         
         mock_responses = {
             "simple": f"[MOCK SIMPLE] Processing: {prompt[:50]}...",
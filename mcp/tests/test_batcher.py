@@ -0,0 +1,110 @@
+"""
+Tests for the request micro-batcher
+"""
+import asyncio
+import time
+import pytest
+from mcp.services._batcher import MicroBatcher
+
+@pytest.mark.asyncio
+async def test_submit_coalesces_concurrent_requests():
+    """Test that requests submitted together are processed as one batch"""
+    batch_sizes = []
+    
+    def process(items):
+        batch_sizes.append(len(items))
+        return [item * 2 for item in items]
+    
+    batcher = MicroBatcher(process, max_batch=32, max_wait_ms=50.0)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+    await batcher.stop()
+    
+    assert results == [0, 2, 4, 6, 8]
+    assert batch_sizes == [5]
+
+@pytest.mark.asyncio
+async def test_submit_respects_max_batch():
+    """Test that batches are split at max_batch and results keep their order"""
+    batch_sizes = []
+    
+    def process(items):
+        batch_sizes.append(len(items))
+        return [f"result-{item}" for item in items]
+    
+    batcher = MicroBatcher(process, max_batch=4, max_wait_ms=50.0)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+    await batcher.stop()
+    
+    assert results == [f"result-{i}" for i in range(10)]
+    assert sum(batch_sizes) == 10
+    assert max(batch_sizes) <= 4
+
+@pytest.mark.asyncio
+async def test_exception_result_fails_only_its_request():
+    """Test that an Exception returned for one item does not fail the others"""
+    def process(items):
+        return [ValueError(f"bad item {item}") if item < 0 else item for item in items]
+    
+    batcher = MicroBatcher(process, max_wait_ms=50.0)
+    results = await asyncio.gather(
+        batcher.submit(1), batcher.submit(-1), batcher.submit(2),
+        return_exceptions=True
+    )
+    await batcher.stop()
+    
+    assert results[0] == 1
+    assert isinstance(results[1], ValueError)
+    assert results[2] == 2
+
+@pytest.mark.asyncio
+async def test_raising_process_batch_fails_whole_batch():
+    """Test that an exception raised by process_batch reaches every submitter"""
+    def process(items):
+        raise RuntimeError("backend down")
+    
+    batcher = MicroBatcher(process, max_wait_ms=50.0)
+    results = await asyncio.gather(
+        batcher.submit(1), batcher.submit(2), return_exceptions=True
+    )
+    await batcher.stop()
+    
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+@pytest.mark.asyncio
+async def test_stop_finishes_inflight_batches():
+    """Test that stop waits for a batch already handed to the executor"""
+    def process(items):
+        time.sleep(0.05)
+        return items
+    
+    batcher = MicroBatcher(process, max_wait_ms=1.0)
+    request = asyncio.ensure_future(batcher.submit("payload"))
+    await asyncio.sleep(0.02)  # let the batch reach the executor
+    
+    await batcher.stop()
+    
+    assert await request == "payload"
+
+@pytest.mark.asyncio
+async def test_stop_cancels_queued_requests():
+    """Test that requests still in the queue are cancelled by stop"""
+    batcher = MicroBatcher(lambda items: items, max_wait_ms=50.0)
+    request = asyncio.ensure_future(batcher.submit("queued"))
+    await asyncio.sleep(0)  # enqueue before the batching task first runs
+    
+    await batcher.stop()
+    
+    with pytest.raises(asyncio.CancelledError):
+        await request
+
+@pytest.mark.asyncio
+async def test_stop_cancels_partially_collected_batch():
+    """Test that stopping while a batch is still collecting cancels its requests"""
+    batcher = MicroBatcher(lambda items: items, max_batch=8, max_wait_ms=200.0)
+    
+    pending = asyncio.ensure_future(batcher.submit("collecting"))
+    await asyncio.sleep(0.02)
+    await batcher.stop()
+    
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(pending, timeout=1.0)
@@ -0,0 +1,36 @@
+"""
+Tests for the configuration loader
+"""
+import pytest
+from mcp.utils.config_loader import ConfigLoader
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    """Work in an empty directory so default configs land in tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "config"
+
+@pytest.mark.asyncio
+async def test_load_configs_reads_created_defaults(config_dir):
+    """Test that default configs written on first use load back unchanged"""
+    loader = ConfigLoader()
+    await loader._create_default_config()
+    created = loader.snapshot()
+    
+    reloaded = ConfigLoader()
+    await reloaded.load_configs()
+    
+    assert reloaded.snapshot() == created
+    assert not list(config_dir.glob("*.tmp"))
+
+@pytest.mark.asyncio
+async def test_mutating_loaded_config_does_not_leak_into_reload(config_dir):
+    """Test that in-memory edits don't change what the next load returns"""
+    await ConfigLoader()._create_default_config()
+    loader = ConfigLoader()
+    await loader.load_configs()
+    
+    loader.get_config("jira")["project_key"] = "CHANGED"
+    await loader.load_configs()
+    
+    assert loader.get_config("jira")["project_key"] == "DEV"
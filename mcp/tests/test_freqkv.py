@@ -12,48 +12,40 @@ def freqkv_service():
 @pytest.fixture
 def sample_kv_cache():
     """Generate sample KV cache for testing"""
-    np.random.seed(42)
-    return np.random.randn(100, 64).tolist()
+    return np.random.default_rng(42).standard_normal((100, 64))
 
-@pytest.mark.asyncio
-async def test_compress_basic(freqkv_service, sample_kv_cache):
+def test_compress_basic(freqkv_service, sample_kv_cache):
     """Test basic compression functionality"""
-    compressed = await freqkv_service.compress(
+    compressed = freqkv_service.compress(
         sample_kv_cache, 
         sink_tokens=10, 
         compression_ratio=0.5
     )
     
     # Should preserve sink tokens + compressed tokens
-    expected_size = 10 + int((len(sample_kv_cache) - 10) * 0.5)
-    assert len(compressed) == expected_size
-    assert len(compressed[0]) == len(sample_kv_cache[0])  # Same feature dimension
+    expected_size = 10 + int((sample_kv_cache.shape[0] - 10) * 0.5)
+    assert compressed.shape == (expected_size, sample_kv_cache.shape[1])  # Same feature dimension
 
-@pytest.mark.asyncio
-async def test_compress_small_cache(freqkv_service):
+def test_compress_small_cache(freqkv_service):
     """Test compression with cache smaller than sink tokens"""
     small_cache = [[1.0, 2.0], [3.0, 4.0]]
-    compressed = await freqkv_service.compress(small_cache, sink_tokens=10)
+    compressed = freqkv_service.compress(small_cache, sink_tokens=10)
     
     # Should return unchanged
     assert compressed == small_cache
 
-@pytest.mark.asyncio
-async def test_compress_preserve_sink_tokens(freqkv_service, sample_kv_cache):
+def test_compress_preserve_sink_tokens(freqkv_service, sample_kv_cache):
     """Test that sink tokens are preserved exactly"""
     sink_tokens = 5
-    compressed = await freqkv_service.compress(
+    compressed = freqkv_service.compress(
         sample_kv_cache, 
         sink_tokens=sink_tokens
     )
     
     # First sink_tokens should be identical
-    original_array = np.array(sample_kv_cache)
-    compressed_array = np.array(compressed)
-    
     np.testing.assert_array_equal(
-        original_array[:sink_tokens], 
-        compressed_array[:sink_tokens]
+        sample_kv_cache[:sink_tokens], 
+        compressed[:sink_tokens]
     )
 
 def test_compression_stats(freqkv_service):
@@ -66,17 +58,58 @@ def test_compression_stats(freqkv_service):
     assert stats["space_savings"] == 0.5
     assert stats["reduction_factor"] == 2.0
 
-@pytest.mark.asyncio
-async def test_compress_different_ratios(freqkv_service, sample_kv_cache):
+def test_compress_different_ratios(freqkv_service, sample_kv_cache):
     """Test compression with different ratios"""
     ratios = [0.3, 0.5, 0.8]
     
     for ratio in ratios:
-        compressed = await freqkv_service.compress(
+        compressed = freqkv_service.compress(
             sample_kv_cache,
             sink_tokens=5,
             compression_ratio=ratio
         )
         
-        expected_size = 5 + int((len(sample_kv_cache) - 5) * ratio)
-        assert len(compressed) == expected_size
+        expected_size = 5 + int((sample_kv_cache.shape[0] - 5) * ratio)
+        assert compressed.shape[0] == expected_size
+
+def test_compress_ndarray_input(freqkv_service, sample_kv_cache):
+    """Test that array input is returned as an array without list conversion"""
+    kv_array = sample_kv_cache.astype(np.float32)
+    compressed = freqkv_service.compress(
+        kv_array,
+        sink_tokens=10,
+        compression_ratio=0.5
+    )
+    
+    assert isinstance(compressed, np.ndarray)
+    assert compressed.shape == (10 + int(90 * 0.5), 64)
+    np.testing.assert_array_equal(compressed[:10], kv_array[:10])
+
+def test_compress_small_sequence_matches_dct(freqkv_service):
+    """Test that the basis-matmul path for short sequences matches SciPy's DCT"""
+    from scipy.fft import dct, idct
+    
+    np.random.seed(0)
+    kv_array = np.random.randn(30, 16).astype(np.float32)
+    compressed = freqkv_service.compress(kv_array, sink_tokens=4, compression_ratio=0.5)
+    
+    n_keep = int(26 * 0.5)
+    coeffs = dct(kv_array[4:], axis=0, norm='ortho')[:n_keep]
+    expected = idct(coeffs, n=n_keep, axis=0, norm='ortho') * np.sqrt(n_keep / 26)
+    np.testing.assert_allclose(compressed[4:], expected, rtol=1e-4, atol=1e-5)
+
+def test_compress_keep_all_frequencies(freqkv_service, sample_kv_cache):
+    """Test that a ratio of 1.0 returns the cache unchanged"""
+    kv_array = sample_kv_cache.astype(np.float32)
+    compressed = freqkv_service.compress(kv_array, sink_tokens=10, compression_ratio=1.0)
+    
+    np.testing.assert_array_equal(compressed, kv_array)
+
+@pytest.mark.parametrize("n_tokens", [30, 200])
+def test_compress_preserves_constant_amplitude(freqkv_service, n_tokens):
+    """Test that a constant cache keeps its values on both DCT paths"""
+    kv_array = np.full((n_tokens, 8), 1.0, dtype=np.float32)
+    compressed = freqkv_service.compress(kv_array, sink_tokens=4, compression_ratio=0.5)
+    
+    assert compressed.shape == (4 + int((n_tokens - 4) * 0.5), 8)
+    np.testing.assert_allclose(compressed, 1.0, rtol=1e-5)
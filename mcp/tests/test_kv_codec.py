@@ -0,0 +1,75 @@
+"""
+Tests for the KV cache wire codecs
+"""
+import base64
+import numpy as np
+import pytest
+from mcp.utils.kv_codec import (
+    decode_fp16_b64,
+    decode_int8_b64,
+    dequantize_int8_rows,
+    encode_fp16_b64,
+    quantize_int8_rows
+)
+
+@pytest.fixture
+def kv_array():
+    return np.random.default_rng(42).standard_normal((20, 8)).astype(np.float32)
+
+def _int8_payload(kv_array):
+    quantized, scales = quantize_int8_rows(kv_array)
+    return (
+        base64.b64encode(quantized.tobytes()).decode("ascii"),
+        base64.b64encode(scales.tobytes()).decode("ascii")
+    )
+
+def test_fp16_round_trip(kv_array):
+    """Test that fp16 encoding round-trips within float16 precision"""
+    decoded = decode_fp16_b64(encode_fp16_b64(kv_array), kv_array.shape)
+    
+    assert decoded.dtype == np.float32
+    assert decoded.shape == kv_array.shape
+    np.testing.assert_allclose(decoded, kv_array, rtol=1e-3, atol=1e-3)
+
+def test_int8_quantization_round_trip(kv_array):
+    """Test that per-row int8 quantization stays within half a step per row"""
+    quantized, scales = quantize_int8_rows(kv_array)
+    restored = dequantize_int8_rows(quantized, scales)
+    
+    assert quantized.dtype == np.int8
+    assert scales.shape == (kv_array.shape[0],)
+    assert np.all(np.abs(restored - kv_array) <= scales[:, None] / 2 + 1e-6)
+
+def test_int8_quantization_zero_row():
+    """Test that an all-zero row quantizes without dividing by zero"""
+    quantized, scales = quantize_int8_rows(np.zeros((2, 4), dtype=np.float32))
+    
+    assert np.all(quantized == 0)
+    np.testing.assert_array_equal(dequantize_int8_rows(quantized, scales), 0.0)
+
+def test_int8_b64_round_trip(kv_array):
+    """Test decoding a base64 int8 payload with its scales"""
+    data, scales_data = _int8_payload(kv_array)
+    decoded = decode_int8_b64(data, scales_data, kv_array.shape)
+    
+    assert decoded.shape == kv_array.shape
+    np.testing.assert_allclose(decoded, kv_array, atol=np.abs(kv_array).max() / 127)
+
+@pytest.mark.parametrize("shape", [[160], [20, 8, 1], [10, 8]])
+def test_decode_fp16_rejects_bad_shape(kv_array, shape):
+    """Test that shapes that aren't [tokens, dims] matching the buffer are rejected"""
+    with pytest.raises(ValueError, match="kv_shape"):
+        decode_fp16_b64(encode_fp16_b64(kv_array), shape)
+
+def test_decode_int8_rejects_mismatched_scales(kv_array):
+    """Test that the scales buffer must hold one scale per row"""
+    data, _ = _int8_payload(kv_array)
+    short_scales = base64.b64encode(np.ones(5, dtype=np.float32).tobytes()).decode("ascii")
+    
+    with pytest.raises(ValueError, match="per-row scales"):
+        decode_int8_b64(data, short_scales, kv_array.shape)
+
+def test_decode_fp16_rejects_zero_tokens():
+    """Test that an empty [0, dims] cache is rejected"""
+    with pytest.raises(ValueError, match="at least one token"):
+        decode_fp16_b64("", [0, 8])
@@ -3,6 +3,7 @@ Tests for LoCoCo Service
 """
 import pytest
 import numpy as np
+from mcp.services import lococo_service as lococo_module
 from mcp.services.lococo_service import LoCoCoService
 
 @pytest.fixture
@@ -12,65 +13,58 @@ def lococo_service():
 @pytest.fixture
 def sample_kv_cache():
     """Generate sample KV cache for testing"""
-    np.random.seed(42)
-    return np.random.randn(200, 64).tolist()
+    return np.random.default_rng(42).standard_normal((200, 64))
 
-@pytest.mark.asyncio
-async def test_fuse_basic(lococo_service, sample_kv_cache):
+def test_fuse_basic(lococo_service, sample_kv_cache):
     """Test basic fusion functionality"""
-    fused = await lococo_service.fuse(
+    fused = lococo_service.fuse(
         sample_kv_cache, 
         target_ratio=0.5
     )
     
-    expected_size = int(len(sample_kv_cache) * 0.5)
-    assert len(fused) == expected_size
-    assert len(fused[0]) == len(sample_kv_cache[0])  # Same feature dimension
+    expected_size = int(sample_kv_cache.shape[0] * 0.5)
+    assert fused.shape == (expected_size, sample_kv_cache.shape[1])  # Same feature dimension
 
-@pytest.mark.asyncio
-async def test_fuse_target_size(lococo_service, sample_kv_cache):
+def test_fuse_target_size(lococo_service, sample_kv_cache):
     """Test fusion with explicit target size"""
     target_size = 50
-    fused = await lococo_service.fuse(
+    fused = lococo_service.fuse(
         sample_kv_cache, 
         target_size=target_size
     )
     
-    assert len(fused) == target_size
+    assert fused.shape[0] == target_size
 
-@pytest.mark.asyncio
-async def test_fuse_small_cache(lococo_service):
+def test_fuse_small_cache(lococo_service):
     """Test fusion with small cache"""
     small_cache = [[1.0, 2.0], [3.0, 4.0]]
     target_size = 5
     
-    fused = await lococo_service.fuse(small_cache, target_size=target_size)
+    fused = lococo_service.fuse(small_cache, target_size=target_size)
     
     # Should return original since it's smaller than target
     assert fused == small_cache
 
-@pytest.mark.asyncio
-async def test_fuse_empty_cache(lococo_service):
+def test_fuse_empty_cache(lococo_service):
     """Test fusion with empty cache"""
     empty_cache = []
-    fused = await lococo_service.fuse(empty_cache)
+    fused = lococo_service.fuse(empty_cache)
     
     assert fused == []
 
-@pytest.mark.asyncio
-async def test_fuse_different_kernel_sizes(lococo_service, sample_kv_cache):
+def test_fuse_different_kernel_sizes(lococo_service, sample_kv_cache):
     """Test fusion with different kernel sizes"""
     kernel_sizes = [3, 7, 11]
     
     for kernel_size in kernel_sizes:
-        fused = await lococo_service.fuse(
+        fused = lococo_service.fuse(
             sample_kv_cache,
             target_ratio=0.5,
             kernel_size=kernel_size
         )
         
-        expected_size = int(len(sample_kv_cache) * 0.5)
-        assert len(fused) == expected_size
+        expected_size = int(sample_kv_cache.shape[0] * 0.5)
+        assert fused.shape[0] == expected_size
 
 def test_fusion_stats(lococo_service):
     """Test fusion statistics calculation"""
@@ -82,22 +76,48 @@ def test_fusion_stats(lococo_service):
     assert stats["kernel_size"] == 7
     assert stats["tokens_per_fused"] == 2.0
 
-@pytest.mark.asyncio
-async def test_fuse_preserves_information(lococo_service):
+def test_fuse_preserves_information(lococo_service):
     """Test that fusion preserves some information from original"""
     # Create structured test data
-    structured_cache = []
-    for i in range(100):
-        # Create tokens with pattern
-        token = [float(i % 10)] * 32  # Pattern in first half
-        token.extend([float(i // 10)] * 32)  # Different pattern in second half
-        structured_cache.append(token)
+    i = np.arange(100, dtype=np.float64)[:, None]
+    structured_cache = np.concatenate([
+        np.repeat(i % 10, 32, axis=1),  # Pattern in first half
+        np.repeat(i // 10, 32, axis=1)  # Different pattern in second half
+    ], axis=1)
     
-    fused = await lococo_service.fuse(structured_cache, target_ratio=0.5)
+    fused = lococo_service.fuse(structured_cache, target_ratio=0.5)
     
     # Should have reduced size
-    assert len(fused) == 50
+    assert fused.shape == (50, 64)
     
     # Fused tokens should be averages, not just random values
-    fused_array = np.array(fused)
-    assert not np.allclose(fused_array, 0)  # Should have meaningful values
+    assert not np.allclose(fused, 0)  # Should have meaningful values
+
+def test_fuse_ndarray_input(lococo_service, sample_kv_cache):
+    """Test that array input is returned as an array without list conversion"""
+    kv_array = sample_kv_cache.astype(np.float32)
+    fused = lococo_service.fuse(kv_array, target_ratio=0.5)
+    
+    assert isinstance(fused, np.ndarray)
+    assert fused.shape == (100, 64)
+
+@pytest.mark.skipif(not lococo_module.NUMBA_AVAILABLE, reason="numba not installed")
+@pytest.mark.parametrize("n_tokens,target_size,kernel_size", [
+    (200, 100, 7),
+    (200, 37, 3),
+    (101, 50, 11),
+    (64, 8, 1),
+    (30, 29, 7),
+    (5, 2, 7),  # fewer tokens than the kernel: padding only
+])
+def test_fusion_numpy_fallback_matches_numba(monkeypatch, n_tokens, target_size, kernel_size):
+    """Test that the NumPy fallback and the Numba kernel fuse identically"""
+    cache = np.random.default_rng(0).standard_normal((n_tokens, 16)).astype(np.float32)
+    
+    numba_fused = LoCoCoService().apply_convolution_fusion(cache, target_size, kernel_size)
+    
+    monkeypatch.setattr(lococo_module, "NUMBA_AVAILABLE", False)
+    numpy_fused = LoCoCoService().apply_convolution_fusion(cache, target_size, kernel_size)
+    
+    assert numpy_fused.shape == numba_fused.shape
+    np.testing.assert_allclose(numpy_fused, numba_fused, rtol=1e-5, atol=1e-6)
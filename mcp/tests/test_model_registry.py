@@ -0,0 +1,58 @@
+"""
+Tests for the model registry
+"""
+import pytest
+from mcp.utils import json_io
+from mcp.utils.model_registry import ModelRegistry
+
+@pytest.mark.asyncio
+async def test_save_config_round_trip(tmp_path):
+    """Test that a saved registry loads back with the same mappings"""
+    config_path = tmp_path / "config" / "model_registry.json"
+    registry = ModelRegistry()
+    await registry.initialize(str(config_path))
+    registry.register_model("tiny", "mock://tiny")
+    registry.set_complexity_mapping("simple", "tiny")
+    await registry.save_config(str(config_path))
+    
+    reloaded = ModelRegistry()
+    await reloaded.initialize(str(config_path))
+    
+    assert reloaded.snapshot() == registry.snapshot()
+    assert reloaded.get_model_for_complexity("simple") == "mock://tiny"
+    assert not list(config_path.parent.glob("*.tmp"))
+
+@pytest.mark.asyncio
+async def test_failed_save_keeps_previous_file(tmp_path, monkeypatch):
+    """Test that a write that fails midway leaves the old config intact"""
+    config_path = tmp_path / "model_registry.json"
+    registry = ModelRegistry()
+    await registry.initialize(str(config_path))
+    await registry.save_config(str(config_path))
+    original = config_path.read_bytes()
+    
+    def fail(*args):
+        raise RuntimeError("disk full")
+    
+    # The temporary file is written, then moving it into place fails
+    monkeypatch.setattr(json_io.os, "replace", fail)
+    registry.register_model("tiny", "mock://tiny")
+    with pytest.raises(RuntimeError):
+        await registry.save_config(str(config_path))
+    
+    assert config_path.read_bytes() == original
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_concurrent_atomic_writes_never_mix(tmp_path):
+    """Test that concurrent writers to one path always leave a complete file"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    config_path = tmp_path / "model_registry.json"
+    payloads = [{"writer": i, "models": {f"m{j}": "mock://x" * 50 for j in range(50)}} for i in range(8)]
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for _ in range(50):
+            list(pool.map(lambda payload: json_io.write_json_atomic(config_path, payload), payloads))
+            assert json_io.loads(config_path.read_bytes()) in payloads
+    
+    assert not list(tmp_path.glob("*.tmp"))
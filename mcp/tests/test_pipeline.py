@@ -0,0 +1,53 @@
+"""
+Tests for the fused compression pipeline
+"""
+import pytest
+import numpy as np
+from mcp.services.freqkv_service import FreqKVService
+from mcp.services.lococo_service import LoCoCoService
+from mcp.services.pipeline import CompressionPipeline
+
+@pytest.fixture
+def pipeline():
+    return CompressionPipeline(FreqKVService(), LoCoCoService())
+
+@pytest.fixture
+def sample_kv_cache():
+    """Generate sample KV cache for testing"""
+    np.random.seed(42)
+    return np.random.randn(200, 64).astype(np.float32)
+
+def test_compress_and_fuse_matches_services(pipeline, sample_kv_cache):
+    """Test that the fused pass matches FreqKV followed by LoCoCo on the non-sink tokens"""
+    result = pipeline.compress_and_fuse(
+        sample_kv_cache, sink_tokens=10, freq_ratio=0.7, target_ratio=0.5
+    )
+    
+    freq_compressed = pipeline.freqkv.compress(
+        sample_kv_cache, sink_tokens=10, compression_ratio=0.7
+    )
+    n_keep = len(freq_compressed) - 10
+    fused = pipeline.lococo.fuse(
+        freq_compressed[10:], target_size=int(n_keep * 0.5)
+    )
+    
+    assert result.shape == (10 + len(fused), 64)
+    np.testing.assert_array_equal(result[:10], sample_kv_cache[:10])
+    np.testing.assert_allclose(result[10:], fused, rtol=1e-5, atol=1e-5)
+
+def test_compress_and_fuse_batch(pipeline, sample_kv_cache):
+    """Test that a stacked batch gives the same result as each cache alone"""
+    kv_batch = np.stack([sample_kv_cache, sample_kv_cache[::-1]])
+    
+    results = pipeline.compress_and_fuse(kv_batch, sink_tokens=10)
+    
+    for kv_cache, result in zip(kv_batch, results):
+        expected = pipeline.compress_and_fuse(kv_cache, sink_tokens=10)
+        np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-5)
+
+def test_compress_and_fuse_small_cache(pipeline):
+    """Test that a cache no larger than the sink tokens is returned unchanged"""
+    small_cache = [[1.0, 2.0], [3.0, 4.0]]
+    result = pipeline.compress_and_fuse(small_cache, sink_tokens=10)
+    
+    assert result == small_cache
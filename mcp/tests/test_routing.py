@@ -0,0 +1,97 @@
+"""
+Tests for Routing Service
+"""
+import pytest
+from mcp.services.routing_service import RoutingService
+
+@pytest.fixture
+def routing_service():
+    return RoutingService()
+
+def test_classify_keyword_levels(routing_service):
+    """Test that level keywords drive the classification"""
+    assert routing_service.classify_complexity("Fix the indentation here please") == "simple"
+    assert routing_service.classify_complexity("Design a new data pipeline") == "complex"
+
+def test_classify_short_prompt_fast_path(routing_service):
+    """Test that short prompts without moderate/complex hints are simple"""
+    assert routing_service.classify_complexity("fix typo") == "simple"
+    assert routing_service.classify_complexity("migrate db") == "complex"
+
+def test_classify_code_indicator_threshold(routing_service):
+    """Test that five or more code indicators score as complex"""
+    prompt = "class function method interface enum"
+    assert routing_service.classify_complexity(prompt) == "complex"
+
+def test_classify_many_matches_single(routing_service):
+    """Test that batch classification matches classifying one prompt at a time"""
+    prompts = [
+        "fix typo",
+        "Refactor this class to use dependency injection",
+        "Design a microservices architecture for this e-commerce platform",
+        "Explain how this algorithm handles the edge cases in the code"
+    ]
+    contexts = ["", "", "", "distributed concurrent protocol"]
+    
+    expected = [
+        routing_service.classify_complexity(prompt, context)
+        for prompt, context in zip(prompts, contexts)
+    ]
+    assert routing_service.classify_many(prompts, contexts) == expected
+    assert routing_service.classify_many([]) == []
+
+@pytest.mark.parametrize("prompt", [
+    "explain how to debug error in this code",
+    "explain: write method then build class for this code",
+    "describe why we test bug fixes and write function code"
+])
+def test_classify_counts_every_pattern_match(routing_service, prompt):
+    """Test that a greedy pattern does not hide later matches at the same level"""
+    assert routing_service.classify_complexity(prompt) == "moderate"
+
+def test_classify_length_counts_whitespace_words(routing_service):
+    """Test that code-like tokens don't inflate the prompt length heuristic"""
+    prompt = "fix this line: " + " ".join(["self.cfg.get(a,b)"] * 21)
+    assert routing_service.classify_complexity(prompt) == "simple"
+
+def test_classify_many_rejects_mismatched_contexts(routing_service):
+    """Test that contexts must line up with prompts"""
+    with pytest.raises(ValueError):
+        routing_service.classify_many(["fix typo", "design an api"], [""])
+
+def test_classify_cache_hit_skips_scoring(routing_service, monkeypatch):
+    """Test that a repeated classification is served from the cache"""
+    prompt = "Design a new data pipeline"
+    assert routing_service.classify_complexity(prompt) == "complex"
+    
+    def fail_score(full_text):
+        raise AssertionError("cached classification was rescored")
+    
+    monkeypatch.setattr(routing_service, "_score", fail_score)
+    assert routing_service.classify_complexity(prompt) == "complex"
+    assert len(routing_service._classify_cache) == 1
+    assert all(len(key) == 16 for key in routing_service._classify_cache)
+
+def test_classify_cache_evicts_least_recently_used(routing_service, monkeypatch):
+    """Test that the cache drops the least recently used entry once full"""
+    monkeypatch.setattr(routing_service, "_cache_max", 2)
+    first = "Design a new data pipeline"
+    second = "Refactor this class to use dependency injection"
+    third = "Explain how this algorithm handles the edge cases"
+    
+    routing_service.classify_complexity(first)
+    routing_service.classify_complexity(second)
+    # Touch the first entry so the second becomes least recently used
+    routing_service.classify_complexity(first)
+    routing_service.classify_complexity(third)
+    
+    scored = []
+    score = routing_service._score
+    monkeypatch.setattr(routing_service, "_score", lambda text: scored.append(text) or score(text))
+    
+    routing_service.classify_complexity(first)
+    routing_service.classify_complexity(third)
+    assert scored == []
+    routing_service.classify_complexity(second)
+    assert len(scored) == 1
+    assert len(routing_service._classify_cache) == 2
@@ -0,0 +1,135 @@
+"""
+Tests for the MCP server compression tool
+"""
+import asyncio
+import base64
+import json
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from mcp import server
+from mcp.utils.kv_codec import decode_fp16_b64, encode_fp16_b64, quantize_int8_rows
+
+@pytest.fixture
+def kv_array():
+    return np.random.default_rng(42).standard_normal((100, 64)).astype(np.float32)
+
+def test_compression_batch_isolates_failures(kv_array):
+    """Test that one failing request in a batch does not fail the others"""
+    results = server._process_compression_batch([
+        (kv_array, 10, 0.5),
+        (kv_array, -500, 0.5),
+        (kv_array * 2, 10, 0.5)
+    ])
+    
+    assert isinstance(results[0], np.ndarray)
+    assert isinstance(results[1], Exception)
+    np.testing.assert_allclose(results[2], results[0] * 2, rtol=1e-4, atol=1e-4)
+
+def test_compression_batch_stacks_matching_requests(kv_array):
+    """Test that same-shaped requests give the same results as running alone"""
+    results = server._process_compression_batch([(kv_array, 10, 0.5), (kv_array[::-1], 10, 0.5)])
+    
+    for kv_cache, result in zip([kv_array, kv_array[::-1]], results):
+        expected = server.compression_pipeline.compress_and_fuse(kv_cache, sink_tokens=10, target_ratio=0.5)
+        np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-5)
+
+@pytest.mark.parametrize("field,value", [
+    ("sink_tokens", -1),
+    ("compression_ratio", 0.0),
+    ("compression_ratio", 1.5)
+])
+def test_compression_request_rejects_invalid_settings(field, value):
+    """Test that sink_tokens and compression_ratio are range-checked"""
+    with pytest.raises(ValidationError):
+        server.KVCompressionRequest(kv_cache=[[1.0, 2.0]], **{field: value})
+
+@pytest.mark.asyncio
+async def test_invalid_request_does_not_fail_concurrent_request(kv_array):
+    """Test that a rejected request leaves a concurrent valid one untouched"""
+    results = await asyncio.gather(
+        server.compress_kv_cache({"kv_cache": kv_array.tolist(), "sink_tokens": 10}),
+        server.compress_kv_cache({"kv_cache": kv_array.tolist(), "sink_tokens": -500}),
+        return_exceptions=True
+    )
+    await server.compression_batcher.stop()
+    
+    assert results[0]["original_size"] == 100
+    assert isinstance(results[1], ValueError)
+
+@pytest.mark.asyncio
+async def test_compress_fp16_payload_returns_fp16(kv_array):
+    """Test the base64 float16 request and response path"""
+    result = await server.compress_kv_cache({
+        "kv_cache_fp16_b64": encode_fp16_b64(kv_array),
+        "kv_shape": list(kv_array.shape),
+        "sink_tokens": 10
+    })
+    await server.compression_batcher.stop()
+    
+    compressed = decode_fp16_b64(result["compressed_kv_fp16_b64"], result["compressed_shape"])
+    expected = server.compression_pipeline.compress_and_fuse(
+        decode_fp16_b64(encode_fp16_b64(kv_array), kv_array.shape), sink_tokens=10, target_ratio=0.5
+    )
+    assert "compressed_kv" not in result
+    assert result["original_size"] == 100
+    assert result["compressed_shape"] == list(expected.shape)
+    np.testing.assert_allclose(compressed, expected, rtol=1e-2, atol=1e-2)
+
+@pytest.mark.asyncio
+async def test_compress_int8_payload(kv_array):
+    """Test the base64 int8 request path"""
+    quantized, scales = quantize_int8_rows(kv_array)
+    result = await server.compress_kv_cache({
+        "kv_cache_int8_b64": base64.b64encode(quantized.tobytes()).decode("ascii"),
+        "kv_scales_b64": base64.b64encode(scales.tobytes()).decode("ascii"),
+        "kv_shape": list(kv_array.shape),
+        "sink_tokens": 10
+    })
+    await server.compression_batcher.stop()
+    
+    assert result["original_size"] == 100
+    assert result["compressed_shape"][1] == 64
+    assert "compressed_kv_fp16_b64" in result
+
+@pytest.mark.asyncio
+async def test_compress_rejects_bad_binary_shape(kv_array):
+    """Test that a 1-D kv_shape is reported as a shape error"""
+    with pytest.raises(ValueError, match="kv_shape"):
+        await server.compress_kv_cache({
+            "kv_cache_fp16_b64": encode_fp16_b64(kv_array),
+            "kv_shape": [kv_array.size]
+        })
+
+@pytest.mark.parametrize("payload", [
+    {"kv_cache_fp16_b64": "", "kv_shape": [0, 64]},
+    {"kv_cache_int8_b64": "", "kv_scales_b64": "", "kv_shape": [0, 64]}
+])
+@pytest.mark.asyncio
+async def test_compress_rejects_empty_binary_cache(payload):
+    """Test that a zero-token binary cache is rejected before compression"""
+    with pytest.raises(ValueError, match="at least one token"):
+        await server.compress_kv_cache(payload)
+
+@pytest.mark.asyncio
+async def test_mcp_request_renders_binary_response(kv_array):
+    """Test the binary path through the MCP handler and its JSON rendering"""
+    response = await server.handle_mcp_request(server.MCPRequest(
+        method="tools/call",
+        params={
+            "name": "compress_kv_cache",
+            "arguments": {
+                "kv_cache_fp16_b64": encode_fp16_b64(kv_array),
+                "kv_shape": list(kv_array.shape)
+            }
+        },
+        id="1"
+    ))
+    await server.compression_batcher.stop()
+    
+    body = json.loads(response.body)
+    assert body["error"] is None
+    result = body["result"]
+    compressed = decode_fp16_b64(result["compressed_kv_fp16_b64"], result["compressed_shape"])
+    assert compressed.shape == tuple(result["compressed_shape"])
@@ -1,12 +1,15 @@
 """
 Config Loader - Manages MCP configuration files
 """
-import json
 import asyncio
+import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
 import logging
 
+from .json_io import loads, write_json_atomic
+
 logger = logging.getLogger(__name__)
 
 class ConfigLoader:
@@ -14,7 +17,10 @@ class ConfigLoader:
     
     def __init__(self):
         self.configs: Dict[str, Any] = {}
+        self._configs_view = MappingProxyType(self.configs)
         self.vscode_config_path = Path.cwd() / ".vscode" / "mcp.json"
+        # Raw JSON file contents keyed by path, with the mtime they were read at
+        self._file_cache: Dict[Path, Tuple[int, bytes]] = {}
         
     async def load_configs(self, config_path: Optional[str] = None):
         """Load all MCP configurations"""
@@ -39,8 +45,9 @@ class ConfigLoader:
         """Load VS Code MCP configuration file"""
         if self.vscode_config_path.exists():
             try:
-                with open(self.vscode_config_path, 'r') as f:
-                    vscode_config = json.load(f)
+                vscode_config = await asyncio.to_thread(
+                    self._read_json_cached, self.vscode_config_path
+                )
                 
                 self.configs["vscode"] = vscode_config
                 logger.info(f"Loaded VS Code MCP config from {self.vscode_config_path}")
@@ -53,7 +60,7 @@ class ConfigLoader:
     
     async def _load_service_configs(self):
         """Load service-specific configurations"""
-        config_dir = Path.cwd() / "config"
+        config_dir = os.path.join(os.getcwd(), "config")
         
         # Load individual service configs
         service_configs = [
@@ -63,27 +70,56 @@ class ConfigLoader:
             "model_registry.json"
         ]
         
-        for config_file in service_configs:
-            config_path = config_dir / config_file
-            if config_path.exists():
-                try:
-                    with open(config_path, 'r') as f:
-                        config_data = json.load(f)
-                    
-                    service_name = config_file.replace("_config.json", "").replace(".json", "")
-                    self.configs[service_name] = config_data
-                    logger.info(f"Loaded {service_name} config")
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to load {config_file}: {e}")
+        # One directory listing instead of an existence check per file
+        entries = await asyncio.to_thread(self._scan_config_dir, config_dir)
+        existing = [config_file for config_file in service_configs if config_file in entries]
+        
+        # Read and parse the files concurrently on the default thread pool
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._read_json_cached, Path(entries[config_file]))
+              for config_file in existing),
+            return_exceptions=True
+        )
+        
+        for config_file, config_data in zip(existing, results):
+            if isinstance(config_data, Exception):
+                logger.warning(f"Failed to load {config_file}: {config_data}")
+                continue
+            
+            service_name = config_file.replace("_config.json", "").replace(".json", "")
+            self.configs[service_name] = config_data
+            logger.info(f"Loaded {service_name} config")
+    
+    @staticmethod
+    def _scan_config_dir(config_dir: str) -> Dict[str, str]:
+        """Map file names in config_dir to their paths (empty if the directory is missing)"""
+        try:
+            with os.scandir(config_dir) as it:
+                return {entry.name: entry.path for entry in it if entry.is_file()}
+        except FileNotFoundError:
+            return {}
+    
+    def _read_json_cached(self, path: Path) -> Any:
+        """
+        Read a JSON file, reusing its bytes while the mtime is unchanged
+        
+        Every call parses a fresh object, so callers that mutate a loaded
+        config can't change what the next load returns. Parsing with orjson
+        is several times cheaper than deep-copying a cached object.
+        """
+        mtime_ns = path.stat().st_mtime_ns
+        cached = self._file_cache.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return loads(cached[1])
+        
+        raw = path.read_bytes()
+        self._file_cache[path] = (mtime_ns, raw)
+        return loads(raw)
     
     async def _create_default_config(self):
         """Create default MCP configuration files"""
         logger.info("Creating default MCP configuration")
         
-        # Create .vscode directory if it doesn't exist
-        self.vscode_config_path.parent.mkdir(parents=True, exist_ok=True)
-        
         # Default VS Code MCP configuration
         default_vscode_config = {
             "mcpServers": {
@@ -120,8 +156,9 @@ class ConfigLoader:
         }
         
         # Save VS Code config
-        with open(self.vscode_config_path, 'w') as f:
-            json.dump(default_vscode_config, f, indent=2)
+        await asyncio.to_thread(
+            write_json_atomic, self.vscode_config_path, default_vscode_config
+        )
         
         self.configs["vscode"] = default_vscode_config
         
@@ -133,7 +170,6 @@ class ConfigLoader:
     async def _create_service_configs(self):
         """Create default service configuration files"""
         config_dir = Path.cwd() / "config"
-        config_dir.mkdir(parents=True, exist_ok=True)
         
         # Jira configuration
         jira_config = {
@@ -182,11 +218,13 @@ class ConfigLoader:
             ("model_registry.json", model_registry_config)
         ]
         
+        # Write the files concurrently so their filesystem latency overlaps
+        await asyncio.gather(*(
+            asyncio.to_thread(write_json_atomic, config_dir / filename, config_data)
+            for filename, config_data in configs_to_create
+        ))
+        
         for filename, config_data in configs_to_create:
-            config_path = config_dir / filename
-            with open(config_path, 'w') as f:
-                json.dump(config_data, f, indent=2)
-            
             # Store in configs dict
             service_name = filename.replace("_config.json", "").replace(".json", "")
             self.configs[service_name] = config_data
@@ -197,9 +235,13 @@ class ConfigLoader:
         """Get configuration for specific service"""
         return self.configs.get(service_name)
     
-    def get_all_configs(self) -> Dict[str, Any]:
-        """Get all loaded configurations"""
-        return self.configs.copy()
+    def get_all_configs(self) -> Mapping[str, Any]:
+        """Get a read-only view of all loaded configurations"""
+        return self._configs_view
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a mutable copy of all loaded configurations"""
+        return dict(self.configs)
     
     async def update_config(self, service_name: str, config_data: Dict[str, Any]):
         """Update configuration for specific service"""
@@ -211,9 +253,6 @@ class ConfigLoader:
         else:
             config_path = Path.cwd() / "config" / f"{service_name}_config.json"
         
-        config_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(config_path, 'w') as f:
-            json.dump(config_data, f, indent=2)
+        await asyncio.to_thread(write_json_atomic, config_path, config_data)
         
         logger.info(f"Updated {service_name} configuration")
@@ -0,0 +1,53 @@
+"""
+JSON I/O helpers - orjson when installed, stdlib json otherwise
+"""
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(data: bytes) -> Any:
+    """Parse JSON from bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps_indented(obj: Any) -> bytes:
+    """Serialize to JSON bytes indented by two spaces, as written to config files"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+def write_json_atomic(path: Path, obj: Any):
+    """
+    Write obj as indented JSON, creating parent directories as needed
+    
+    The data goes to a uniquely named temporary file in the same directory,
+    which is flushed to disk and then replaces the target. Concurrent writers
+    never share a temporary file, and a crash mid-write never leaves a
+    truncated file behind.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = dumps_indented(obj)
+    
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            # mkstemp creates the file owner-only; keep the usual config permissions
+            os.fchmod(f.fileno(), 0o644)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
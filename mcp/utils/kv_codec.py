@@ -0,0 +1,57 @@
+"""
+KV Codec - Compact binary wire formats for KV cache payloads
+"""
+import base64
+from typing import Sequence, Tuple
+import numpy as np
+
+def _check_shape(shape: Sequence[int], n_values: int) -> Tuple[int, int]:
+    """Validate a [tokens, dims] shape against the number of decoded values"""
+    if len(shape) != 2:
+        raise ValueError(f"kv_shape must be [tokens, dims], got {list(shape)}")
+    n_tokens, n_dims = (int(dim) for dim in shape)
+    if n_tokens < 0 or n_dims < 0:
+        raise ValueError(f"kv_shape must not be negative, got {list(shape)}")
+    if n_tokens == 0:
+        raise ValueError(f"kv_shape must have at least one token, got {list(shape)}")
+    if n_tokens * n_dims != n_values:
+        raise ValueError(
+            f"kv_shape {list(shape)} needs {n_tokens * n_dims} values, buffer has {n_values}"
+        )
+    return n_tokens, n_dims
+
+def decode_fp16_b64(data: str, shape: Sequence[int]) -> np.ndarray:
+    """Decode a base64 float16 buffer into a float32 array of the given shape"""
+    raw = np.frombuffer(base64.b64decode(data), dtype=np.float16)
+    return raw.reshape(_check_shape(shape, raw.size)).astype(np.float32)
+
+def encode_fp16_b64(array: np.ndarray) -> str:
+    """Encode an array as a base64 float16 buffer"""
+    return base64.b64encode(array.astype(np.float16).tobytes()).decode("ascii")
+
+def quantize_int8_rows(array: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize each row to int8 with its own scale
+
+    Returns:
+        Tuple of (int8 values, float32 per-row scales)
+    """
+    scales = np.abs(array).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.round(array / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+def dequantize_int8_rows(quantized: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """Reverse quantize_int8_rows, returning a float32 array"""
+    return quantized.astype(np.float32) * scales.astype(np.float32)[:, None]
+
+def decode_int8_b64(data: str, scales_data: str, shape: Sequence[int]) -> np.ndarray:
+    """Decode base64 int8 values and float32 per-row scales into a float32 array"""
+    raw = np.frombuffer(base64.b64decode(data), dtype=np.int8)
+    quantized = raw.reshape(_check_shape(shape, raw.size))
+    scales = np.frombuffer(base64.b64decode(scales_data), dtype=np.float32)
+    if scales.size != quantized.shape[0]:
+        raise ValueError(
+            f"Expected {quantized.shape[0]} per-row scales, got {scales.size}"
+        )
+    return dequantize_int8_rows(quantized, scales)
@@ -1,10 +1,13 @@
 """
 Model Registry - Manages LLM endpoints and routing configuration
 """
-from typing import Dict, Any, Optional
-import json
+from typing import Dict, Any, Mapping, Optional
+import asyncio
 import logging
 from pathlib import Path
+from types import MappingProxyType
+
+from .json_io import loads, write_json_atomic
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +22,8 @@ class ModelRegistry:
             "moderate": "ollama://mistral",
             "complex": "ollama://llama3"
         }
+        self._rebuild_views()
+        self._resolved: Dict[str, str] = dict(self.default_models)
         
     async def initialize(self, config_path: Optional[str] = None):
         """Initialize model registry with configuration"""
@@ -38,11 +43,12 @@ class ModelRegistry:
     async def _load_config(self, config_path: str):
         """Load model configuration from JSON file"""
         try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
+            config = await asyncio.to_thread(self._read_json, Path(config_path))
             
             self.models = config.get("models", {})
             self.complexity_mapping = config.get("complexity_mapping", {})
+            self._rebuild_views()
+            self._rebuild_resolved()
             
             logger.info(f"Loaded model registry from {config_path}")
             logger.info(f"Available models: {list(self.models.keys())}")
@@ -63,19 +69,28 @@ class ModelRegistry:
         }
         
         self.complexity_mapping = self.default_models.copy()
+        self._rebuild_views()
+        self._rebuild_resolved()
         
         logger.info("Using default model registry configuration")
     
+    def _rebuild_resolved(self):
+        """Merge the configured mappings over the defaults into one lookup table"""
+        for complexity in self.default_models:
+            if not self.complexity_mapping.get(complexity):
+                logger.warning(f"No model configured for complexity '{complexity}', using fallback")
+        
+        # Empty mappings fall back to the default, as an unconfigured level would
+        self._resolved = {
+            **self.default_models,
+            **{c: m for c, m in self.complexity_mapping.items() if m}
+        }
+    
     def get_model_for_complexity(self, complexity: str) -> str:
         """Get model endpoint for given complexity level"""
-        model_endpoint = self.complexity_mapping.get(complexity)
-        
-        if not model_endpoint:
-            # Fallback to default if not configured
-            model_endpoint = self.default_models.get(complexity, "mock://default")
-            logger.warning(f"No model configured for complexity '{complexity}', using fallback")
-        
-        logger.info(f"Routing {complexity} complexity to {model_endpoint}")
+        model_endpoint = self._resolved.get(complexity, "mock://default")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Routing %s complexity to %s", complexity, model_endpoint)
         return model_endpoint
     
     def register_model(self, name: str, endpoint: str):
@@ -89,27 +104,39 @@ class ModelRegistry:
             raise ValueError(f"Model '{model_name}' not registered")
         
         self.complexity_mapping[complexity] = self.models[model_name]
+        self._rebuild_resolved()
         logger.info(f"Mapped complexity '{complexity}' to model '{model_name}'")
     
-    def get_available_models(self) -> Dict[str, str]:
-        """Get all available models"""
-        return self.models.copy()
+    def _rebuild_views(self):
+        """Point the read-only views at the current model and mapping dicts"""
+        self._models_view = MappingProxyType(self.models)
+        self._complexity_view = MappingProxyType(self.complexity_mapping)
     
-    def get_complexity_mappings(self) -> Dict[str, str]:
-        """Get current complexity to model mappings"""
-        return self.complexity_mapping.copy()
+    def get_available_models(self) -> Mapping[str, str]:
+        """Get a read-only view of all available models"""
+        return self._models_view
+    
+    def get_complexity_mappings(self) -> Mapping[str, str]:
+        """Get a read-only view of the current complexity to model mappings"""
+        return self._complexity_view
+    
+    def snapshot(self) -> Dict[str, Dict[str, str]]:
+        """Get mutable copies of the models and complexity mappings"""
+        return {
+            "models": dict(self.models),
+            "complexity_mapping": dict(self.complexity_mapping)
+        }
     
     async def save_config(self, config_path: str):
         """Save current configuration to file"""
-        config = {
-            "models": self.models,
-            "complexity_mapping": self.complexity_mapping
-        }
-        
-        # Ensure directory exists
-        Path(config_path).parent.mkdir(parents=True, exist_ok=True)
+        # Copy so registrations made while the write runs don't race the serializer
+        config = self.snapshot()
         
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        await asyncio.to_thread(write_json_atomic, Path(config_path), config)
         
         logger.info(f"Saved model registry to {config_path}")
+    
+    @staticmethod
+    def _read_json(path: Path) -> Dict[str, Any]:
+        """Read and parse a JSON file (runs on a worker thread)"""
+        return loads(path.read_bytes())